@@ -0,0 +1,297 @@
+"""Bulk import papers into the portfolio catalog.
+
+Usage:
+    python bulk_import.py SOURCE_DIR [--manifest FILE] [--workers N]
+
+Run from the repository root. SOURCE_DIR holds the papers and a manifest
+(manifest.csv or manifest.json by default) with one row per paper:
+
+    title, upload_date, pdf, thumbnail, related_files, web_link,
+    model_link, abstract, conclusion, objectives, summary
+
+File paths are relative to SOURCE_DIR. In a CSV, related_files is a
+semicolon separated list; in JSON it is a list. Related files keep their
+subdirectories, so sub/notes.txt and notes.txt can both be imported.
+Titles already in the catalog, or repeated in the manifest, are skipped.
+
+Papers are processed in parallel and the catalog is written once at the
+end. Finished papers are journaled, so an interrupted import picks up
+where it stopped when run again.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image
+from pypdf import PdfReader
+
+from catalog import generate_slug, load_papers, sanitize_filename, save_papers, setup_directories
+
+JOURNAL_PATH = 'data/bulk_import.journal'
+DEFAULT_THUMB = 'static/images/Document1 - WPS Office 22_05_2025 17_36_57.png'
+THUMB_SIZE = (500, 450)  # same size display_home() renders at
+SUMMARY_CHARS = 3000
+MANIFEST_FIELDS = ['title', 'upload_date', 'pdf', 'thumbnail', 'related_files', 'web_link',
+                   'model_link', 'abstract', 'conclusion', 'objectives', 'summary']
+
+
+def read_manifest(path):
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            rows = json.load(f)
+    else:
+        # utf-8-sig strips the BOM Excel puts in front of the header row
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+
+    entries = []
+    for row in rows:
+        entry = {field: (row.get(field) or '') for field in MANIFEST_FIELDS}
+        related = entry['related_files']
+        if isinstance(related, str):
+            related = [p.strip() for p in related.split(';') if p.strip()]
+        entry['related_files'] = related
+        if not entry['title'] or not entry['pdf']:
+            raise ValueError(f"Manifest row is missing a title or pdf: {row}")
+        names = [related_target_name(p) for p in related]
+        duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Related files listed twice for {entry['title']!r}: {duplicates}")
+        entries.append(entry)
+    return entries
+
+
+def find_manifest(source_dir):
+    for name in ('manifest.csv', 'manifest.json'):
+        path = os.path.join(source_dir, name)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No manifest.csv or manifest.json in {source_dir}")
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_atomic(src, dest):
+    tmp_path = f"{dest}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+def extract_text(pdf_path):
+    try:
+        reader = PdfReader(pdf_path)
+        text = "\n".join((page.extract_text() or '') for page in reader.pages).strip()
+    except Exception as e:
+        print(f"Text extraction failed for {pdf_path}: {e}", file=sys.stderr)
+        return ''
+    if not text:
+        print(f"No extractable text in {pdf_path}; summary left empty", file=sys.stderr)
+    return text
+
+
+def pdf_target_name(pdf_path):
+    """Name the PDF will get in static/files, before any hash suffix."""
+    return sanitize_filename(os.path.basename(pdf_path))
+
+
+def related_target_name(rel_path):
+    """Path of a related file inside the paper's related_files directory."""
+    name = os.path.normpath(rel_path).replace(os.sep, '/')
+    if os.path.isabs(name) or name.startswith('../') or name == '..':
+        raise ValueError(f"Related file must be inside the source directory: {rel_path}")
+    return name
+
+
+def build_thumbnail(src, dest):
+    with Image.open(src) as img:
+        img = img.convert('RGB').resize(THUMB_SIZE)
+        tmp_path = f"{dest}.{os.getpid()}.tmp"
+        img.save(tmp_path, format='PNG')
+    os.replace(tmp_path, dest)
+
+
+def process_paper(entry, slug, source_dir, shared_pdf):
+    """Copy one paper's files into static/ and return its catalog record.
+
+    Runs in a worker process. Every path written is either unique to the
+    slug or named after the file's content hash, so workers never race.
+    """
+    pdf_src = os.path.join(source_dir, entry['pdf'])
+    pdf_hash = hash_file(pdf_src)
+
+    # Keep the original name unless another paper already owns it
+    stem, ext = os.path.splitext(pdf_target_name(entry['pdf']))
+    pdf_filename = f"{stem}{ext}"
+    pdf_dest = os.path.join('static/files', pdf_filename)
+    if shared_pdf or (os.path.exists(pdf_dest) and hash_file(pdf_dest) != pdf_hash):
+        pdf_filename = f"{stem}_{pdf_hash[:8]}{ext}"
+        pdf_dest = os.path.join('static/files', pdf_filename)
+    if not os.path.exists(pdf_dest):
+        copy_atomic(pdf_src, pdf_dest)
+
+    if entry['thumbnail']:
+        thumb_url = f"static/images/{slug}.png"
+        build_thumbnail(os.path.join(source_dir, entry['thumbnail']), thumb_url)
+    else:
+        thumb_url = DEFAULT_THUMB
+
+    related_dir = os.path.join('static/related_files', slug)
+    os.makedirs(related_dir, exist_ok=True)
+    related_filenames = []
+    for rel_path in entry['related_files']:
+        name = related_target_name(rel_path)
+        dest = os.path.join(related_dir, name)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        copy_atomic(os.path.join(source_dir, rel_path), dest)
+        related_filenames.append(name)
+
+    summary = entry['summary']
+    if not summary:
+        summary = extract_text(pdf_src)[:SUMMARY_CHARS]
+
+    return {
+        "title": entry['title'],
+        "slug": slug,
+        "filename": pdf_filename,
+        "thumb_url": thumb_url,
+        "upload_date": entry['upload_date'] or time.strftime('%Y-%m-%d'),
+        "dir": slug,
+        "related_files": related_filenames,
+        "web_link": entry['web_link'],
+        "model_link": entry['model_link'],
+        "abstract": entry['abstract'],
+        "conclusion": entry['conclusion'],
+        "objectives": entry['objectives'],
+        "summary": summary,
+    }
+
+
+def plan_slugs(entries, papers):
+    """Assign each new entry a unique slug.
+
+    Titles already in the catalog are skipped, as are repeats of a title
+    earlier in the manifest: delete_paper() removes papers by title, so two
+    papers sharing one could not be deleted separately.
+    """
+    seen_titles = {p['title'] for p in papers}
+    manifest_titles = set()
+    taken = {p['slug'] for p in papers}
+    planned = []
+    for entry in entries:
+        if entry['title'] in manifest_titles:
+            print(f"Skipping repeated manifest title: {entry['title']}", file=sys.stderr)
+        manifest_titles.add(entry['title'])
+        if entry['title'] in seen_titles:
+            continue
+        seen_titles.add(entry['title'])
+        base = generate_slug(entry['title'])
+        slug, n = base, 2
+        while slug in taken:
+            slug, n = f"{base}-{n}", n + 1
+        taken.add(slug)
+        planned.append((entry, slug))
+    return planned
+
+
+def load_journal():
+    done = {}
+    if os.path.exists(JOURNAL_PATH):
+        with open(JOURNAL_PATH, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted run
+                done[record['slug']] = record
+    return done
+
+
+def append_journal(journal, record):
+    journal.write(json.dumps(record) + "\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def bulk_import(source_dir, manifest_path=None, workers=None):
+    setup_directories()
+    entries = read_manifest(manifest_path or find_manifest(source_dir))
+    papers = load_papers()
+    planned = plan_slugs(entries, papers)
+    # Only trust journal records that still belong to the same paper; edits
+    # to the manifest between runs can move a slug to a different title
+    journal = load_journal()
+    done = {slug: journal[slug] for entry, slug in planned
+            if slug in journal and journal[slug]['title'] == entry['title']}
+
+    # Papers whose PDFs would land on the same sanitized name get
+    # content-addressed names, so no two workers write the same file
+    pdf_counts = Counter(pdf_target_name(entry['pdf']) for entry, _ in planned)
+    shared = {name for name, count in pdf_counts.items() if count > 1}
+    pending = [(entry, slug) for entry, slug in planned if slug not in done]
+
+    print(f"{len(planned)} new papers, {len(planned) - len(pending)} already done, {len(pending)} to process")
+
+    failures = []
+    start = time.perf_counter()
+    with open(JOURNAL_PATH, 'a') as journal, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(process_paper, entry, slug, source_dir, pdf_target_name(entry['pdf']) in shared): entry
+            for entry, slug in pending
+        }
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                failures.append(entry['title'])
+                print(f"Failed: {entry['title']}: {e}", file=sys.stderr)
+                continue
+            done[record['slug']] = record
+            append_journal(journal, record)
+    elapsed = time.perf_counter() - start
+
+    # Single catalog write, newest (manifest order) first like admin_panel().
+    # Re-read the catalog so papers uploaded during the import are kept.
+    new_papers = [done[slug] for _, slug in planned if slug in done]
+    if new_papers:
+        current = load_papers()
+        current_titles = {p['title'] for p in current}
+        new_papers = [p for p in new_papers if p['title'] not in current_titles]
+        save_papers(new_papers + current)
+    # Everything journaled is now in the catalog; failures are retried by title
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+
+    processed = len(pending) - len(failures)
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"Imported {len(new_papers)} papers ({processed} this run in {elapsed:.1f}s, {rate:.2f} papers/s)")
+    if failures:
+        print(f"{len(failures)} papers failed; fix them and run again to resume", file=sys.stderr)
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import papers into data/papers.json")
+    parser.add_argument("source_dir", help="Directory containing the papers and manifest")
+    parser.add_argument("--manifest", help="CSV or JSON manifest (default: SOURCE_DIR/manifest.csv or .json)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    ok = bulk_import(args.source_dir, args.manifest, args.workers)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
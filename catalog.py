@@ -0,0 +1,60 @@
+"""Paper catalog helpers shared by the Streamlit app and the bulk importer.
+
+Nothing here imports streamlit or the LLM/database clients, so command-line
+tools and worker processes can use it without starting the app.
+"""
+import json
+import os
+import re
+import tempfile
+
+CATALOG_PATH = 'data/papers.json'
+REQUIRED_DIRS = ['static/files', 'static/images', 'static/related_files', 'data']
+
+
+def setup_directories():
+    for dir_path in REQUIRED_DIRS:
+        os.makedirs(dir_path, exist_ok=True)
+    if not os.path.exists(CATALOG_PATH):
+        with open(CATALOG_PATH, 'w') as f:
+            json.dump([], f)
+
+
+# Load Papers Data
+def load_papers():
+    try:
+        with open(CATALOG_PATH, 'r') as f:
+            papers = json.load(f)
+            # Ensure each paper has a slug
+            for paper in papers:
+                if 'slug' not in paper:
+                    paper['slug'] = generate_slug(paper['title'])
+            return papers
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def save_papers(papers):
+    # Write to a unique temp file first so readers never see a half-written
+    # catalog and concurrent writers don't clobber each other's temp file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CATALOG_PATH), prefix='papers.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(papers, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file owner-only
+        os.replace(tmp_path, CATALOG_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# sanitize filenames
+def sanitize_filename(filename):
+    return "".join(c for c in filename if c.isalnum() or c in (' ', '.', '_')).rstrip()
+
+
+def generate_slug(title):
+    return re.sub(r'\W+', '-', title.lower())
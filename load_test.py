@@ -0,0 +1,434 @@
+"""Concurrent-session load test for portfolio.py.
+
+Usage:
+    python load_test.py [--levels 1,2,4,8] [--rounds 3] [--llm-latency 0.5]
+                        [--mix home=4,read=2,chat=3,contact=1]
+
+Starts one real `streamlit run portfolio.py` server and drives simulated
+visitors against it with headless websocket clients speaking Streamlit's
+protobuf protocol, so every session shares the one process, its GIL, its
+cache_resource store and its event loop, as real visitors would. The Groq
+LLM, MySQL and tiktoken are replaced inside the server with local
+stand-ins, so no keys or network are needed. Clients do not fetch images
+or other media, only the script reruns are measured.
+
+For each concurrency level it reports throughput and p50/p95/p99 latency
+of successful reruns, failed reruns, and the server's RSS growth per
+concurrent session, sampled while the level is running.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(ROOT, 'portfolio.py')
+QUESTIONS = [
+    "What is the title?",
+    "Summarize the abstract in two sentences.",
+    "Which models were compared and how did they perform?",
+    "What are the main research objectives?",
+]
+
+
+# --- Local stand-ins (installed in the server process) ---
+class FakeChatGroq:
+    """Stand-in for langchain_groq.ChatGroq with a fixed response latency."""
+    latency = 0.0
+
+    def __init__(self, **kwargs):
+        self.model_name = kwargs.get('model_name', '')
+
+    def invoke(self, messages):
+        time.sleep(self.latency)
+        question = messages[-1]['content'] if messages else ''
+        return types.SimpleNamespace(
+            content=f"<think>Reasoning about: {question}</think>This is a canned answer to: {question}"
+        )
+
+
+class FakeEncoding:
+    """Stand-in for a tiktoken encoding; one token per whitespace separated word."""
+
+    def encode(self, text):
+        return text.split()
+
+
+class FakeError(Exception):
+    pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def execute(self, query, params=()):
+        self.db.insert(query, params)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    """Stand-in for mysql.connector that appends inserted rows to a JSON lines file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def connect(self, **kwargs):
+        return FakeConnection(self)
+
+    def insert(self, query, params):
+        with self.lock, open(self.path, 'a') as f:
+            f.write(json.dumps({"query": query, "params": list(params)}) + "\n")
+
+
+def install_stand_ins(llm_latency, db_path):
+    """Register fake langchain_groq, mysql.connector and tiktoken modules before the app imports them."""
+    FakeChatGroq.latency = llm_latency
+    groq_module = types.ModuleType('langchain_groq')
+    groq_module.ChatGroq = FakeChatGroq
+
+    db = FakeDatabase(db_path)
+    connector = types.ModuleType('mysql.connector')
+    connector.connect = db.connect
+    connector.Error = FakeError
+    mysql = types.ModuleType('mysql')
+    mysql.connector = connector
+
+    tiktoken = types.ModuleType('tiktoken')
+    tiktoken.get_encoding = lambda name: FakeEncoding()
+
+    sys.modules['langchain_groq'] = groq_module
+    sys.modules['mysql'] = mysql
+    sys.modules['mysql.connector'] = connector
+    sys.modules['tiktoken'] = tiktoken
+
+
+def serve(port, llm_latency, db_path):
+    """Run `streamlit run portfolio.py` in this process with the stand-ins installed."""
+    install_stand_ins(llm_latency, db_path)
+    from streamlit.web import cli
+
+    sys.argv = [
+        'streamlit', 'run', APP_PATH,
+        '--server.headless', 'true',
+        '--server.port', str(port),
+        '--server.fileWatcherType', 'none',
+        '--browser.gatherUsageStats', 'false',
+        '--logger.level', 'error',
+    ]
+    sys.exit(cli.main())
+
+
+def start_server(args, db_path):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(port),
+         '--llm-latency', str(args.llm_latency), '--db-path', db_path],
+        cwd=ROOT,  # the app uses paths relative to the repo root
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Streamlit server exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Streamlit server did not become healthy within 60s")
+
+
+def process_rss(pid):
+    """Resident set size of a process in bytes."""
+    with open(f'/proc/{pid}/statm', 'r') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+# --- Headless websocket client ---
+class Session:
+    """One simulated browser tab talking to the server over /_stcore/stream."""
+
+    def __init__(self, ws, timeout):
+        self.ws = ws
+        self.timeout = timeout
+        self.query_string = ''
+        self.widgets = {}  # (element type, label) -> widget id from the last run
+        self.states = {}  # widget id -> WidgetState kept across reruns, like a browser
+
+    async def rerun(self, triggers=()):
+        """Request a rerun and wait for the script to finish; returns its latency."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        msg.rerun_script.widget_states.widgets.extend(list(self.states.values()) + list(triggers))
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._read_until_finished(), self.timeout)
+        return time.perf_counter() - start
+
+    async def _read_until_finished(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        error = None
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof('type')
+            if kind == 'new_session':
+                # Every script run, including one triggered by st.rerun(), starts here
+                self.widgets, error = {}, None
+            elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                element = msg.delta.new_element
+                element_type = element.WhichOneof('type')
+                proto = getattr(element, element_type)
+                if element_type == 'exception':
+                    error = proto.message
+                elif getattr(proto, 'id', ''):
+                    label = getattr(proto, 'label', '') or getattr(proto, 'placeholder', '')
+                    self.widgets[(element_type, label)] = proto.id
+            elif kind == 'script_finished':
+                if msg.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("script failed to compile")
+                if error:
+                    raise RuntimeError(error)
+                return
+
+    def widget_state(self, element_type, label):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        try:
+            return WidgetState(id=self.widgets[(element_type, label)])
+        except KeyError:
+            raise RuntimeError(f"No {element_type} labelled {label!r} on the page") from None
+
+
+# --- Scenarios ---
+# Each scenario drives one session and appends the latency of every
+# successful rerun to timings; a failed rerun raises instead.
+async def browse_home(session, slug, timings):
+    timings.append(await session.rerun())
+
+
+async def read_paper(session, slug, timings):
+    session.query_string = f"read={slug}"
+    timings.append(await session.rerun())
+
+
+async def chat_with_paper(session, slug, timings):
+    session.query_string = f"chat={slug}"
+    timings.append(await session.rerun())
+    for question in random.sample(QUESTIONS, 2):
+        ask = session.widget_state('chat_input', 'Ask about this research...')
+        ask.chat_input_value.data = question
+        timings.append(await session.rerun([ask]))
+
+
+async def submit_contact(session, slug, timings):
+    timings.append(await session.rerun())
+    menu = session.widget_state('selectbox', '**Menu**')
+    menu.string_value = 'Contact'
+    session.states[menu.id] = menu
+    timings.append(await session.rerun())
+
+    fields = []
+    for element_type, label, value in [('text_input', 'Name', 'Load Test'),
+                                       ('text_input', 'Email', 'loadtest@example.com'),
+                                       ('text_area', 'Message', 'Simulated contact message')]:
+        field = session.widget_state(element_type, label)
+        field.string_value = value
+        fields.append(field)
+    send = session.widget_state('button', 'Send')
+    send.trigger_value = True
+    timings.append(await session.rerun(fields + [send]))
+
+
+SCENARIOS = {
+    'home': browse_home,
+    'read': read_paper,
+    'chat': chat_with_paper,
+    'contact': submit_contact,
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, weight = part.split('=')
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def pick_slug():
+    with open(os.path.join(ROOT, 'data/papers.json'), 'r') as f:
+        papers = json.load(f)
+    for paper in papers:
+        if os.path.exists(os.path.join(ROOT, 'static/files', paper['filename'])):
+            return paper['slug']
+    raise RuntimeError("No paper with a PDF in static/files to load test against")
+
+
+async def run_session(port, scenario, slug, timeout):
+    from websockets.asyncio.client import connect
+
+    timings = []
+    try:
+        async with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=['streamlit'],
+                           max_size=None) as ws:
+            await SCENARIOS[scenario](Session(ws, timeout), slug, timings)
+        return timings, None
+    except Exception as e:
+        return timings, f"{scenario}: {type(e).__name__}: {e}"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def sample_rss(pid, peak, stop):
+    while not stop.is_set():
+        peak[0] = max(peak[0], process_rss(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.05)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(server, port, concurrency, rounds, mix, slug, timeout):
+    names, weights = list(mix), list(mix.values())
+
+    async def visitor():
+        results = []
+        for scenario in random.choices(names, weights=weights, k=rounds):
+            results.append(await run_session(port, scenario, slug, timeout))
+        return results
+
+    baseline = process_rss(server.pid)
+    peak, stop = [baseline], asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server.pid, peak, stop))
+    start = time.perf_counter()
+    visitors = await asyncio.gather(*(visitor() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+
+    sessions = [session for results in visitors for session in results]
+    timings = [t for session_timings, _ in sessions for t in session_timings]
+    errors = [error for _, error in sessions if error]
+    return {
+        "concurrency": concurrency,
+        "sessions": len(sessions),
+        "reruns": len(timings),
+        "errors": errors,
+        "throughput": len(timings) / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(timings, 50),
+        "p95": percentile(timings, 95),
+        "p99": percentile(timings, 99),
+        "memory": (peak[0] - baseline) / concurrency,
+        "peak_rss": peak[0],
+    }
+
+
+async def warm_up(port, mix, slug, timeout):
+    """Run each scenario once, untimed, so imports and first compiles aren't measured."""
+    for scenario in mix:
+        _, error = await run_session(port, scenario, slug, timeout)
+        if error:
+            print(f"[warm-up] {error}", file=sys.stderr)
+
+
+def print_report(results):
+    print(f"{'conc':>5} {'sessions':>8} {'ok reruns':>9} {'failed':>6} {'reruns/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'KiB/session':>12} {'peak MiB':>9}")
+    for r in results:
+        print(f"{r['concurrency']:>5} {r['sessions']:>8} {r['reruns']:>9} {len(r['errors']):>6} "
+              f"{r['throughput']:>9.2f} {r['p50'] * 1000:>8.1f} {r['p95'] * 1000:>8.1f} "
+              f"{r['p99'] * 1000:>8.1f} {r['memory'] / 1024:>12.1f} {r['peak_rss'] / 2**20:>9.1f}")
+    for r in results:
+        for error in sorted(set(r['errors'])):
+            print(f"[concurrency {r['concurrency']}] {error}", file=sys.stderr)
+
+
+async def run_load_test(server, port, args, mix, slug):
+    await warm_up(port, mix, slug, args.timeout)
+    results = []
+    for level in (int(n) for n in args.levels.split(',')):
+        results.append(await run_level(server, port, level, args.rounds, mix, slug, args.timeout))
+        print(f"concurrency {level} done", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for portfolio.py")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="Comma separated concurrency levels")
+    parser.add_argument("--rounds", type=int, default=3, help="Sessions each concurrent visitor runs in turn")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds the fake LLM takes to answer")
+    parser.add_argument("--mix", default="home=4,read=2,chat=3,contact=1", help="Scenario weights")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before a rerun is abandoned")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--db-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.llm_latency, args.db_path)
+        return
+
+    random.seed(args.seed)
+    mix = parse_mix(args.mix)
+    slug = pick_slug()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'messages.jsonl')
+        open(db_path, 'w').close()
+        server, port = start_server(args, db_path)
+        try:
+            results = asyncio.run(run_load_test(server, port, args, mix, slug))
+        finally:
+            server.terminate()
+            server.wait()
+        with open(db_path, 'r') as f:
+            stored = sum(1 for _ in f)
+
+    print_report(results)
+    print(f"Contact messages stored by fake MySQL: {stored}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 import streamlit as st
-import json
 import os
 import zipfile
 import io
 import shutil
 import re
+import time
+import threading
 from PIL import Image  # For image processing
 from datetime import datetime
 import mysql.connector
@@ -12,6 +13,7 @@ from mysql.connector import Error
 import base64
 import tiktoken
 from langchain_groq import ChatGroq
+from catalog import generate_slug, load_papers, save_papers, setup_directories
 
 st.set_page_config(
     page_title='J.S', 
@@ -20,41 +22,29 @@ st.set_page_config(
 )
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-llm = ChatGroq(groq_api_key=GROQ_API_KEY, model_name="qwen-qwq-32b")
 MAX_TOKENS = 5000
 
+# Model tiers, tried in order when a tier errors or times out.
+# A question goes to "fast" only if it is short, has no reasoning keywords
+# and the chat context is small; everything else goes to "reasoning".
+MODEL_TIERS = {
+    "fast": {
+        "model_name": os.getenv("FAST_MODEL", "llama-3.1-8b-instant"),
+        "timeout": 15,
+        "max_question_tokens": 30,
+        "max_context_tokens": 2500,
+    },
+    "reasoning": {
+        "model_name": os.getenv("REASONING_MODEL", "qwen-qwq-32b"),
+        "timeout": 60,
+    },
+}
+COMPLEX_KEYWORDS = {'why', 'how', 'explain', 'compare', 'evaluate', 'critique', 'derive', 'justify'}
+# Stems that deliberately match inflections (analyse, analysis, limitations...)
+COMPLEX_STEMS = ('analy', 'implication', 'limitation', 'difference')
+
 # --- Constants and Config ---
 PAPERS_PER_PAGE = 10
-REQUIRED_DIRS = ['static/files', 'static/images', 'static/related_files', 'data']
-
-# 
-def setup_directories():
-    for dir_path in REQUIRED_DIRS:
-        os.makedirs(dir_path, exist_ok=True)
-    if not os.path.exists('data/papers.json'):
-        with open('data/papers.json', 'w') as f:
-            json.dump([], f)
-
-# Load Papers Data
-def load_papers():
-    try:
-        with open('data/papers.json', 'r') as f:
-            papers = json.load(f)
-            # Ensure each paper has a slug
-            for paper in papers:
-                if 'slug' not in paper:
-                    paper['slug'] = generate_slug(paper['title'])
-            return papers
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-def save_papers(papers):
-    with open('data/papers.json', 'w') as f:
-        json.dump(papers, f, indent=2)
-
-# sanitize filenames
-def sanitize_filename(filename):
-    return "".join(c for c in filename if c.isalnum() or c in (' ', '.', '_')).rstrip()
 
 
 # Database setup
@@ -65,7 +55,7 @@ def get_db_connection():
             connection_timeout=10,
             database= os.getenv("database"),
             host="mysql-f3601b9-jonesjorney-bd4e.f.aivencloud.com",
-            password=st.os.getenv("password"),
+            password=os.getenv("password"),
             port=21038,
             user=os.getenv("user")
             )
@@ -75,10 +65,6 @@ def get_db_connection():
         st.error("Check Internet Connection and Try Again!")
         return []
 
-def generate_slug(title):
-    return re.sub(r'\W+', '-', title.lower())
-
-
 #Zip file with related files for the paper
 def create_zip(paper):
     zip_buffer = io.BytesIO()
@@ -88,7 +74,7 @@ def create_zip(paper):
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for root, _, files in os.walk(related_dir):
                 for file in files:
-                    zipf.write(os.path.join(root, file), arcname = file)
+                    zipf.write(os.path.join(root, file), arcname = os.path.relpath(os.path.join(root, file), related_dir))
 
         zip_buffer.seek(0)
         st.download_button(
@@ -111,6 +97,75 @@ def format_response(content: str) -> (str, str):
     return think, resp
 
 
+# Models and stats are cached across reruns and shared by all sessions
+@st.cache_resource
+def get_llm(model_name, timeout):
+    return ChatGroq(groq_api_key=GROQ_API_KEY, model_name=model_name, timeout=timeout, max_retries=0)
+
+
+@st.cache_resource
+def get_model_stats():
+    return {"lock": threading.Lock(), "tiers": {}}
+
+
+def choose_tier(question: str, context_tokens: int) -> str:
+    fast = MODEL_TIERS["fast"]
+    words = re.findall(r'\w+', question.lower())
+    is_complex = any(w in COMPLEX_KEYWORDS or w.startswith(COMPLEX_STEMS) for w in words)
+    if (not is_complex and count_tokens(question) <= fast["max_question_tokens"]
+            and context_tokens <= fast["max_context_tokens"]):
+        return "fast"
+    return "reasoning"
+
+
+def record_model_call(tier: str, seconds: float, prompt_tokens: int, completion_tokens: int, error: bool):
+    stats = get_model_stats()
+    with stats["lock"]:
+        entry = stats["tiers"].setdefault(tier, {
+            "calls": 0, "errors": 0, "total_seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0
+        })
+        entry["calls"] += 1
+        entry["errors"] += int(error)
+        entry["total_seconds"] += seconds
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+
+
+def routed_invoke(messages, question: str, context_tokens: int, models=None):
+    """Send messages to the tier chosen for the question, falling back to the other tiers.
+
+    `models` maps tier names to objects with an `invoke()` method; it defaults
+    to the cached ChatGroq clients and lets local fake models stand in.
+    Returns (tier, result).
+    """
+    first = choose_tier(question, context_tokens)
+    order = [first] + [name for name in MODEL_TIERS if name != first]
+    last_error = None
+
+    for tier in order:
+        config = MODEL_TIERS[tier]
+        model = models[tier] if models else get_llm(config["model_name"], config["timeout"])
+        start = time.perf_counter()
+        try:
+            result = model.invoke(messages)
+        except Exception as e:
+            record_model_call(tier, time.perf_counter() - start, 0, 0, error=True)
+            last_error = e
+            continue
+
+        usage = (getattr(result, "response_metadata", None) or {}).get("token_usage", {})
+        record_model_call(
+            tier,
+            time.perf_counter() - start,
+            usage.get("prompt_tokens", context_tokens),
+            usage.get("completion_tokens", count_tokens(result.content)),
+            error=False,
+        )
+        return tier, result
+
+    raise last_error
+
+
 def get_contextual_response(user_input: str, paper_context: str) -> str:
     
     # Initialize messages if not exists
@@ -142,7 +197,7 @@ def get_contextual_response(user_input: str, paper_context: str) -> str:
         token_count += t
     
     # Get response
-    result = llm.invoke(truncated)
+    _, result = routed_invoke(truncated, user_input, token_count)
     think, resp = format_response(result.content)
     
     # Store response
@@ -481,6 +536,22 @@ def admin_panel():
             else:
                 st.error("Please fill all required fields")
 
+    # Research assistant model usage since the server started
+    stats = get_model_stats()
+    with stats["lock"]:
+        rows = [{
+            "tier": tier,
+            "model": MODEL_TIERS[tier]["model_name"],
+            "calls": s["calls"],
+            "errors": s["errors"],
+            "avg latency (s)": round(s["total_seconds"] / s["calls"], 2) if s["calls"] else 0,
+            "prompt tokens": s["prompt_tokens"],
+            "completion tokens": s["completion_tokens"],
+        } for tier, s in stats["tiers"].items()]
+    if rows:
+        st.subheader("Model Usage")
+        st.table(rows)
+
     # Paper Management
     papers = load_papers()
     for idx, paper in enumerate(papers):
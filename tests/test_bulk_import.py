@@ -0,0 +1,142 @@
+import json
+import os
+
+import pytest
+
+for module in ('PIL', 'pypdf'):
+    pytest.importorskip(module)
+
+from PIL import Image  # noqa: E402
+from pypdf import PdfWriter  # noqa: E402
+
+import bulk_import  # noqa: E402
+from catalog import load_papers, save_papers, setup_directories  # noqa: E402
+
+EXISTING = {"title": "Existing Paper", "slug": "existing-paper", "filename": "existing.pdf"}
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """An empty portfolio tree holding one existing paper, used as the working directory."""
+    monkeypatch.chdir(tmp_path)
+    setup_directories()
+    save_papers([EXISTING])
+    return tmp_path
+
+
+def write_pdf(path):
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "source"
+    (src / "sub").mkdir(parents=True)
+    write_pdf(src / "paper-one.pdf")
+    write_pdf(src / "paper-two.pdf")
+    Image.new('RGB', (40, 30), 'red').save(src / "thumb.png")
+    (src / "r1.txt").write_text("top")
+    (src / "sub" / "r1.txt").write_text("nested")
+    manifest = [
+        {"title": "Paper One", "pdf": "paper-one.pdf", "thumbnail": "thumb.png",
+         "related_files": ["r1.txt", "sub/r1.txt"], "abstract": "First"},
+        {"title": "Paper Two", "pdf": "paper-two.pdf", "summary": "Given"},
+    ]
+    (src / "manifest.json").write_text(json.dumps(manifest))
+    return src
+
+
+def test_read_manifest_handles_excel_bom_and_related_list(tmp_path):
+    path = tmp_path / "manifest.csv"
+    path.write_text("title,pdf,related_files\nA Paper,a.pdf,one.txt; sub/two.txt\n", encoding='utf-8-sig')
+
+    entries = bulk_import.read_manifest(str(path))
+
+    assert entries[0]['title'] == "A Paper"
+    assert entries[0]['related_files'] == ["one.txt", "sub/two.txt"]
+    assert entries[0]['summary'] == ""
+
+
+def test_read_manifest_rejects_bad_rows(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps([{"title": "No PDF"}]))
+    with pytest.raises(ValueError, match="missing a title or pdf"):
+        bulk_import.read_manifest(str(path))
+
+    path.write_text(json.dumps([{"title": "T", "pdf": "t.pdf", "related_files": ["a.txt", "./a.txt"]}]))
+    with pytest.raises(ValueError, match="listed twice"):
+        bulk_import.read_manifest(str(path))
+
+    path.write_text(json.dumps([{"title": "T", "pdf": "t.pdf", "related_files": ["../secret.txt"]}]))
+    with pytest.raises(ValueError, match="inside the source directory"):
+        bulk_import.read_manifest(str(path))
+
+
+def test_plan_slugs_skips_known_and_repeated_titles_and_suffixes_collisions():
+    entries = [{"title": t} for t in ("Existing Paper", "Existing paper!", "New", "New", "new")]
+
+    planned = bulk_import.plan_slugs(entries, [EXISTING])
+
+    assert [(entry['title'], slug) for entry, slug in planned] == [
+        ("Existing paper!", "existing-paper-"),
+        ("New", "new"),
+        ("new", "new-2"),
+    ]
+
+
+def test_bulk_import_copies_files_and_writes_catalog_once(repo, source):
+    assert bulk_import.bulk_import(str(source), workers=1)
+
+    papers = load_papers()
+    assert [p['title'] for p in papers] == ["Paper One", "Paper Two", "Existing Paper"]
+    one, two = papers[0], papers[1]
+    assert one['related_files'] == ["r1.txt", "sub/r1.txt"]
+    assert (repo / "static/related_files/paper-one/sub/r1.txt").read_text() == "nested"
+    assert (repo / "static/related_files/paper-one/r1.txt").read_text() == "top"
+    assert one['thumb_url'] == "static/images/paper-one.png"
+    assert os.path.exists(one['thumb_url'])
+    assert os.path.exists(os.path.join("static/files", two['filename']))
+    assert two['thumb_url'] == bulk_import.DEFAULT_THUMB
+    assert two['summary'] == "Given"
+    assert not os.path.exists(bulk_import.JOURNAL_PATH)
+
+    # A second run finds every title in the catalog and changes nothing
+    assert bulk_import.bulk_import(str(source), workers=1)
+    assert len(load_papers()) == 3
+
+
+def test_bulk_import_resumes_from_journal_only_for_matching_titles(repo, source):
+    with open(bulk_import.JOURNAL_PATH, 'w') as f:
+        f.write(json.dumps({"title": "Paper One", "slug": "paper-one", "summary": "journaled"}) + "\n")
+        # Slug now belongs to a different title, so this record must be ignored
+        f.write(json.dumps({"title": "Old Title", "slug": "paper-two", "summary": "stale"}) + "\n")
+        f.write('{"title": "torn')
+
+    assert bulk_import.bulk_import(str(source), workers=1)
+
+    papers = {p['slug']: p for p in load_papers()}
+    assert papers["paper-one"]['summary'] == "journaled"
+    assert not os.path.exists("static/related_files/paper-one")  # not reprocessed
+    assert papers["paper-two"]['title'] == "Paper Two"
+    assert papers["paper-two"]['summary'] == "Given"
+
+
+def test_bulk_import_keeps_papers_uploaded_during_the_import(repo, source, monkeypatch):
+    uploaded = {"title": "Uploaded Meanwhile", "slug": "uploaded-meanwhile", "filename": "u.pdf"}
+    calls = []
+
+    def load_papers_with_upload():
+        calls.append(1)
+        if len(calls) == 2:  # the re-read right before the final write
+            save_papers([uploaded] + load_papers())
+        return load_papers()
+
+    monkeypatch.setattr(bulk_import, "load_papers", load_papers_with_upload)
+
+    assert bulk_import.bulk_import(str(source), workers=1)
+
+    titles = [p['title'] for p in load_papers()]
+    assert titles == ["Paper One", "Paper Two", "Uploaded Meanwhile", "Existing Paper"]
@@ -0,0 +1,84 @@
+import types
+
+import pytest
+
+for module in ('streamlit', 'langchain_groq', 'mysql.connector', 'tiktoken', 'PIL'):
+    pytest.importorskip(module)
+
+import portfolio  # noqa: E402
+
+
+class FakeModel:
+    """Local stand-in for a ChatGroq tier; raises instead of answering when `error` is set."""
+
+    def __init__(self, answer, error=None):
+        self.answer = answer
+        self.error = error
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return types.SimpleNamespace(
+            content=self.answer,
+            response_metadata={"token_usage": {"prompt_tokens": 12, "completion_tokens": 3}},
+        )
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    # tiktoken downloads its encoding on first use; a word count is enough here
+    monkeypatch.setattr(portfolio, "count_tokens", lambda text: len(text.split()))
+    portfolio.get_model_stats()["tiers"].clear()
+
+
+@pytest.mark.parametrize("question, context_tokens, expected", [
+    ("What is the title?", 100, "fast"),
+    ("However, what is the title?", 100, "fast"),
+    ("How does XGBoost compare to the neural network?", 100, "reasoning"),
+    ("Give me an analysis of the results", 100, "reasoning"),
+    ("What is the title?", 10000, "reasoning"),
+])
+def test_choose_tier(question, context_tokens, expected):
+    assert portfolio.choose_tier(question, context_tokens) == expected
+
+
+def test_routed_invoke_uses_fast_tier_for_simple_questions():
+    models = {"fast": FakeModel("Fast answer"), "reasoning": FakeModel("<think>...</think>Slow answer")}
+
+    tier, result = portfolio.routed_invoke([], "What is the title?", 100, models=models)
+
+    assert tier == "fast"
+    assert result.content == "Fast answer"
+    assert models["reasoning"].calls == 0
+    stats = portfolio.get_model_stats()["tiers"]
+    assert stats["fast"]["calls"] == 1
+    assert stats["fast"]["prompt_tokens"] == 12
+    assert stats["fast"]["completion_tokens"] == 3
+
+
+def test_routed_invoke_falls_back_when_tier_times_out():
+    models = {
+        "fast": FakeModel("Fast answer", error=TimeoutError("fast tier timed out")),
+        "reasoning": FakeModel("<think>...</think>Slow answer"),
+    }
+
+    tier, result = portfolio.routed_invoke([], "What is the title?", 100, models=models)
+
+    assert tier == "reasoning"
+    assert portfolio.format_response(result.content) == ("...", "Slow answer")
+    stats = portfolio.get_model_stats()["tiers"]
+    assert stats["fast"]["errors"] == 1
+    assert stats["reasoning"]["calls"] == 1
+    assert stats["reasoning"]["errors"] == 0
+
+
+def test_routed_invoke_raises_when_every_tier_fails():
+    models = {
+        "fast": FakeModel("", error=TimeoutError("fast tier timed out")),
+        "reasoning": FakeModel("", error=RuntimeError("reasoning tier down")),
+    }
+
+    with pytest.raises(RuntimeError, match="reasoning tier down"):
+        portfolio.routed_invoke([], "What is the title?", 100, models=models)